@@ -4,24 +4,87 @@ Flask API for Romanian Elections 2025 Visualization
 Serves attendance and results data
 """
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from whitenoise import WhiteNoise
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv, feather
+import pyarrow.parquet as pq
 import os
+import io
 import json
+import functools
+import collections
+import threading
+import orjson
 from datetime import datetime
 import logging
 import numpy as np
+
+# Use the accelerated KMeans/PCA from scikit-learn-intelex when it is installed; the patch
+# has to be applied before the estimators are imported
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn(['kmeans', 'pca'])
+except ImportError:
+    pass
+
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 
 # Import the data update functions
-from update_data import process_presence_data, generate_results_data, update_existing_data
+from update_data import (process_presence_data, generate_results_data, update_existing_data, add_urban_rural_estimates,
+                         write_atomically, csv_source_key)
+
+def dumps_json(payload, sort_keys=True):
+    """Serialize payload with orjson, which handles NumPy scalars and arrays natively.
+
+    Keys are sorted by default, matching Flask's default JSON output.
+    """
+    # Non-string keys (e.g. the integer cluster ids) are converted to strings like the stdlib encoder does
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(payload, option=option)
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify() uses it for every endpoint.
+
+    Honors the sort_keys attribute like Flask's DefaultJSONProvider.
+    """
+
+    sort_keys = True
+
+    def dumps(self, obj, **kwargs):
+        return dumps_json(obj, sort_keys=self.sort_keys).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Same argument handling as jsonify(): one positional value, several as a list, or keyword
+        # arguments as an object
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        if len(args) == 1:
+            obj = args[0]
+        else:
+            obj = args or kwargs or None
+        # Skip the bytes -> str -> bytes round trip of the default implementation
+        return self._app.response_class(dumps_json(obj, sort_keys=self.sort_keys), mimetype='application/json')
 
 app = Flask(__name__, static_folder='../frontend/build')
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
+# Serve the built frontend files from WhiteNoise's in-memory file index, ahead of Flask routing.
+# Files are indexed at startup, so restart the server after rebuilding the frontend.
+if os.path.isdir(app.static_folder):
+    app.wsgi_app = WhiteNoise(app.wsgi_app, root=app.static_folder, index_file=True, autorefresh=False)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,14 +96,196 @@ logger = logging.getLogger(__name__)
 # Path to data directory
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
 
-# Route for serving React app
+# Keep the update timestamp as text instead of letting pyarrow infer a datetime, and read empty
+# string cells as missing like pandas does
+CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(column_types={'timestamp': pa.string()}, strings_can_be_null=True)
+
+def read_csv(source, strip_comments=False, columns=None):
+    """Read a CSV file into a DataFrame using the multithreaded pyarrow parser.
+
+    When columns is given, only those columns are converted; if any of them is missing the whole
+    file is read so the caller can report which ones.
+    """
+    if strip_comments:
+        # pyarrow has no comment support, so drop '//' lines before parsing
+        with open(source, 'rb') as f:
+            raw = f.read()
+        if b'//' in raw:
+            raw = b'\n'.join(line for line in raw.split(b'\n') if not line.lstrip().startswith(b'//'))
+        source = io.BytesIO(raw)
+    if columns is not None:
+        try:
+            convert_options = pacsv.ConvertOptions(column_types=CSV_CONVERT_OPTIONS.column_types,
+                                                   strings_can_be_null=True,
+                                                   include_columns=list(columns))
+            return pacsv.read_csv(source, convert_options=convert_options).to_pandas()
+        except KeyError:
+            if isinstance(source, io.BytesIO):
+                source.seek(0)
+    return pacsv.read_csv(source, convert_options=CSV_CONVERT_OPTIONS).to_pandas()
+
+def narrow_counts(df):
+    """Downcast the int64 attendance count columns to int32 where every value fits; others stay int64."""
+    int32 = np.iinfo(np.int32)
+    narrowed = {col: np.int32 for col in COUNT_COLUMNS
+                if col in df.columns and df[col].dtype == np.int64
+                and df[col].min() >= int32.min and df[col].max() <= int32.max}
+    return df.astype(narrowed) if narrowed else df
+
+@functools.lru_cache(maxsize=16)
+def _load_csv(path, mtime_ns):
+    return narrow_counts(read_csv(path))
+
+@functools.lru_cache(maxsize=16)
+def _load_feather(path, mtime_ns, source_key):
+    """Return the Feather copy as a DataFrame, or None if it was not written from the CSV version source_key."""
+    try:
+        table = feather.read_table(path)
+    except (OSError, pa.ArrowException):
+        return None
+    if (table.schema.metadata or {}).get(b'source') != source_key:
+        return None
+    return narrow_counts(table.to_pandas())
+
+def load_data(csv_path):
+    """Return the DataFrame for a data CSV, preferring the Feather copy written by update_data when it is current.
+
+    The result is cached per file mtime and shared between requests, so callers must copy it
+    before modifying it.
+    """
+    csv_mtime = os.stat(csv_path).st_mtime_ns
+    feather_path = os.path.splitext(csv_path)[0] + '.feather'
+    if os.path.exists(feather_path):
+        # The copy records the CSV version it was written with, so a CSV replaced by anything
+        # other than update_data (even with an older mtime) is read directly
+        df = _load_feather(feather_path, os.stat(feather_path).st_mtime_ns, csv_source_key(csv_path))
+        if df is not None:
+            return df
+    return _load_csv(csv_path, csv_mtime)
+
+# Bump when read_csv parses the presence files differently
+PRESENCE_COPY_FORMAT = b'2'
+
+# One lock per presence CSV, so only one thread per process parses it and writes its Parquet copy
+_PRESENCE_LOCKS = collections.defaultdict(threading.Lock)
+
+@functools.lru_cache(maxsize=4)
+def _load_presence(csv_path, source_key, columns):
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    # The Parquet copy records which CSV version (as in the Feather copies) and columns it was written
+    # from, plus PRESENCE_COPY_FORMAT so copies parsed by an older read_csv are rebuilt
+    parquet_key = PRESENCE_COPY_FORMAT + b':' + source_key + b':' + repr(columns).encode()
+    with _PRESENCE_LOCKS[csv_path]:
+        try:
+            if (pq.read_schema(parquet_path).metadata or {}).get(b'source') == parquet_key:
+                return pq.read_table(parquet_path).to_pandas()
+        except (OSError, pa.ArrowException):
+            pass  # No usable copy yet
+        df = read_csv(csv_path, strip_comments=True, columns=columns)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**table.schema.metadata, b'source': parquet_key})
+        # Written atomically so other workers never read a partial file
+        try:
+            write_atomically(parquet_path, lambda tmp_path: pq.write_table(table, tmp_path, compression='zstd'))
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Could not write Parquet copy {parquet_path}: {e}")
+        return df
+
+def load_presence(csv_path, columns):
+    """Return the given columns of a presence CSV, cached per CSV version like load_data.
+
+    The parsed columns are also stored in a zstd-compressed Parquet file next to the CSV, so other
+    workers and restarts load them without parsing the CSV until it changes.
+    """
+    return _load_presence(csv_path, csv_source_key(csv_path), tuple(columns))
+
+@functools.lru_cache(maxsize=4)
+def _county_index(csv_path, mtime_ns):
+    index = {}
+    for record in load_data(csv_path).to_dict(orient='records'):
+        # Keep the first row for a county, as the previous boolean-mask lookup did
+        if isinstance(record['county'], str):
+            index.setdefault(record['county'].lower(), record)
+    return index
+
+def county_index(csv_path):
+    """Return a {lowercase county name: record} lookup for a data file, rebuilt when the file changes.
+
+    The records are shared between requests and must not be modified.
+    """
+    return _county_index(csv_path, os.stat(csv_path).st_mtime_ns)
+
+# Serialized JSON bodies keyed by name, stored together with the version they were built from
+_JSON_CACHE = {}
+
+def cached_json_response(name, version, build_payload):
+    """Serve the cached JSON body for name, rebuilding it when version changes."""
+    cached = _JSON_CACHE.get(name)
+    if cached is None or cached[0] != version:
+        cached = (version, dumps_json(build_payload()))
+        _JSON_CACHE[name] = cached
+    return Response(cached[1], mimetype='application/json')
+
+# Age group columns of the attendance data
+AGE_GROUPS = ['age_18_24', 'age_25_34', 'age_35_44', 'age_45_64', 'age_65_plus']
+
+# Demographic columns the attendance data must provide for /demographic
+BASIC_DEMOGRAPHIC_COLUMNS = ['male_voters', 'female_voters', 'age_18_24', 'age_25_34',
+                             'age_35_44', 'age_45_64', 'age_65_plus', 'urban_stations', 'rural_stations']
+
+# Urban/rural breakdown columns, estimated from station counts when the data lacks them
+URBAN_RURAL_COLUMNS = ['urban_votes', 'rural_votes',
+                       'urban_male_voters', 'urban_female_voters',
+                       'rural_male_voters', 'rural_female_voters',
+                       'urban_age_18_24', 'urban_age_25_34', 'urban_age_35_44',
+                       'urban_age_45_64', 'urban_age_65_plus',
+                       'rural_age_18_24', 'rural_age_25_34', 'rural_age_35_44',
+                       'rural_age_45_64', 'rural_age_65_plus']
+
+# Integer count columns of the attendance data, kept as int32 in memory
+COUNT_COLUMNS = ['total_voters', 'votes_cast'] + BASIC_DEMOGRAPHIC_COLUMNS + URBAN_RURAL_COLUMNS
+
+def column_totals(df, columns):
+    """Sum each column on its NumPy array (int32 sums accumulate in int64) and return native ints."""
+    return {col: int(df[col].to_numpy().sum()) for col in columns}
+
+# Output key -> presence column for the demographic counts returned by /clustering (the percentages
+# come from the matching '<column>_pct' features)
+DEMO_KEYS = (
+    ('male_18_24', 'Barbati 18-24'), ('male_25_34', 'Barbati 25-34'), ('male_35_44', 'Barbati 35-44'),
+    ('male_45_64', 'Barbati 45-64'), ('male_65_plus', 'Barbati 65+'),
+    ('female_18_24', 'Femei 18-24'), ('female_25_34', 'Femei 25-34'), ('female_35_44', 'Femei 35-44'),
+    ('female_45_64', 'Femei 45-64'), ('female_65_plus', 'Femei 65+'),
+)
+# Output keys alone, in column order, for zipping with row values
+DEMO_OUTPUT_KEYS = tuple(key for key, _ in DEMO_KEYS)
+
+# Presence columns /clustering reads out of the ~230 in the file: grouping, totals and demographics
+CLUSTER_INPUT_COLUMNS = ('Judet', 'Localitate', 'Nume sectie de votare', 'Înscriși pe liste permanente', 'LP',
+                         *(col for _, col in DEMO_KEYS))
+
+# Columns identifying a row at each /clustering level
+CLUSTER_LEVEL_COLUMNS = {
+    'county': ['Judet'],
+    'town': ['Judet', 'Localitate'],
+    'polling': ['Judet', 'Localitate', 'Nume sectie de votare'],
+}
+# Response keys for those columns, in the same order
+CLUSTER_LABEL_KEYS = ('county', 'town', 'polling_station')
+
+# Fitted (scaler, kmeans, pca) per (cluster_level, n_clusters), stored with the presence file mtime they were fitted on
+# and the (scaler mean, scaler scale, pca mean, transposed components) arrays used to project new requests.
+# n_clusters comes from the query string, so keep only the most recently used entries, like _build_clustered_payload
+_CLUSTER_MODELS = collections.OrderedDict()
+_CLUSTER_MODELS_MAXSIZE = 8
+_CLUSTER_MODELS_LOCK = threading.Lock()
+
+# Route for serving React app; existing static files never reach Flask (see WhiteNoise above),
+# so any other path gets index.html for client-side routing
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    if path != "" and os.path.exists(app.static_folder + '/' + path):
-        return send_from_directory(app.static_folder, path)
-    else:
-        return send_from_directory(app.static_folder, 'index.html')
+    return send_from_directory(app.static_folder, 'index.html')
 
 @app.route('/')
 def index():
@@ -71,29 +316,26 @@ def get_attendance():
             else:
                 return jsonify({"error": "Attendance data not available"}), 404
         
-        # Read attendance data
-        df = pd.read_csv(csv_path)
-        
-        # Convert NumPy types to native Python types for JSON serialization
-        for col in df.select_dtypes(include=['int64', 'float64']).columns:
-            if 'int' in str(df[col].dtype):
-                df[col] = df[col].astype(int)
-            elif 'float' in str(df[col].dtype):
-                df[col] = df[col].astype(float)
-        
-        # Convert to dictionary for JSON response
-        attendance_data = df.to_dict(orient='records')
-        
-        # Get last update timestamp
-        if attendance_data and 'timestamp' in attendance_data[0]:
-            last_update = attendance_data[0]['timestamp']
-        else:
-            last_update = "Unknown"
+        def build_payload():
+            # Read attendance data
+            df = load_data(csv_path)
+            
+            # Convert to dictionary for JSON response
+            attendance_data = df.to_dict(orient='records')
+            
+            # Get last update timestamp
+            if attendance_data and 'timestamp' in attendance_data[0]:
+                last_update = attendance_data[0]['timestamp']
+            else:
+                last_update = "Unknown"
+            
+            return {
+                "data": attendance_data,
+                "last_update": last_update
+            }
         
-        return jsonify({
-            "data": attendance_data,
-            "last_update": last_update
-        })
+        # The response only changes when the file does, so serve it from cache until then
+        return cached_json_response('attendance', os.stat(csv_path).st_mtime_ns, build_payload)
     except Exception as e:
         logger.error(f"Error in get_attendance: {e}")
         return jsonify({"error": str(e)}), 500
@@ -106,25 +348,12 @@ def get_county_attendance(county):
         if not os.path.exists(csv_path):
             return jsonify({"error": "Attendance data not available"}), 404
         
-        # Read attendance data
-        df = pd.read_csv(csv_path)
-        
         # Find data for the requested county
-        county_data = df[df['county'].str.lower() == county.lower()]
+        county_data_dict = county_index(csv_path).get(county.lower())
         
-        if county_data.empty:
+        if county_data_dict is None:
             return jsonify({"error": f"No data found for county: {county}"}), 404
         
-        # Convert NumPy types to native Python types for JSON serialization
-        for col in county_data.select_dtypes(include=['int64', 'float64']).columns:
-            if 'int' in str(county_data[col].dtype):
-                county_data[col] = county_data[col].astype(int)
-            elif 'float' in str(county_data[col].dtype):
-                county_data[col] = county_data[col].astype(float)
-        
-        # Convert to dictionary for JSON response
-        county_data_dict = county_data.to_dict(orient='records')[0]
-        
         return jsonify({
             "data": county_data_dict,
             "county": county,
@@ -145,29 +374,26 @@ def get_results():
             if not os.path.exists(csv_path):
                 return jsonify({"error": "Results data not available"}), 404
         
-        # Read results data
-        df = pd.read_csv(csv_path)
-        
-        # Convert NumPy types to native Python types for JSON serialization
-        for col in df.select_dtypes(include=['int64', 'float64']).columns:
-            if 'int' in str(df[col].dtype):
-                df[col] = df[col].astype(int)
-            elif 'float' in str(df[col].dtype):
-                df[col] = df[col].astype(float)
-        
-        # Convert to dictionary for JSON response
-        results_data = df.to_dict(orient='records')
-        
-        # Get last update timestamp
-        if results_data and 'timestamp' in results_data[0]:
-            last_update = results_data[0]['timestamp']
-        else:
-            last_update = "Unknown"
+        def build_payload():
+            # Read results data
+            df = load_data(csv_path)
+            
+            # Convert to dictionary for JSON response
+            results_data = df.to_dict(orient='records')
+            
+            # Get last update timestamp
+            if results_data and 'timestamp' in results_data[0]:
+                last_update = results_data[0]['timestamp']
+            else:
+                last_update = "Unknown"
+            
+            return {
+                "data": results_data,
+                "last_update": last_update
+            }
         
-        return jsonify({
-            "data": results_data,
-            "last_update": last_update
-        })
+        # The response only changes when the file does, so serve it from cache until then
+        return cached_json_response('results', os.stat(csv_path).st_mtime_ns, build_payload)
     except Exception as e:
         logger.error(f"Error in get_results: {e}")
         return jsonify({"error": str(e)}), 500
@@ -180,18 +406,12 @@ def get_county_results(county):
         if not os.path.exists(csv_path):
             return jsonify({"error": "Results data not available"}), 404
         
-        # Read results data
-        df = pd.read_csv(csv_path)
-        
         # Find data for the requested county
-        county_data = df[df['county'].str.lower() == county.lower()]
+        county_data_dict = county_index(csv_path).get(county.lower())
         
-        if county_data.empty:
+        if county_data_dict is None:
             return jsonify({"error": f"No data found for county: {county}"}), 404
         
-        # Convert to dictionary for JSON response
-        county_data_dict = county_data.to_dict(orient='records')[0]
-        
         return jsonify({
             "data": county_data_dict,
             "county": county,
@@ -202,6 +422,90 @@ def get_county_results(county):
         return jsonify({"error": str(e)}), 500
     return jsonify(corr)
 
+def percentage_block(counts, divisor, valid):
+    """Return counts (rows x columns) as percentages of the per-row divisor, rounded to one decimal.
+
+    Rows where valid is False are set to NaN. All columns are computed in a single broadcast pass, dividing
+    by 1 where the divisor is zero instead of branching per row.
+    """
+    safe_divisor = np.where(divisor > 0, divisor, 1)
+    pcts = np.round(counts / safe_divisor[:, np.newaxis] * 100, 1)
+    return np.where(valid[:, np.newaxis], pcts, np.nan)
+
+def add_demographic_percentages(totals):
+    """Add the *_percentage columns to a frame of demographic totals with one row per area.
+
+    Percentages whose divisor is zero are NaN; returns a mask of the rows where every percentage is defined.
+    """
+    def add_percentages(columns, divisor, valid):
+        # male_voters -> male_percentage, urban_votes -> urban_percentage, age_18_24 -> age_18_24_percentage
+        keys = [col.replace('_voters', '').replace('_votes', '') + '_percentage' for col in columns]
+        totals[keys] = percentage_block(totals[columns].to_numpy(dtype=np.float64), divisor, valid)
+    
+    total_votes = totals['total_votes'].to_numpy(dtype=np.float64)
+    urban_votes = totals['urban_votes'].to_numpy(dtype=np.float64)
+    rural_votes = totals['rural_votes'].to_numpy(dtype=np.float64)
+    
+    # Basic demographic percentages and the overall urban/rural split
+    has_votes = total_votes > 0
+    add_percentages(['male_voters', 'female_voters'] + AGE_GROUPS + ['urban_votes', 'rural_votes'],
+                    total_votes, has_votes)
+    
+    # Gender and age percentages within urban and rural areas
+    has_urban = has_votes & (urban_votes > 0)
+    has_rural = has_votes & (rural_votes > 0)
+    add_percentages(['urban_male_voters', 'urban_female_voters'] + [f'urban_{age}' for age in AGE_GROUPS],
+                    urban_votes, has_urban)
+    add_percentages(['rural_male_voters', 'rural_female_voters'] + [f'rural_{age}' for age in AGE_GROUPS],
+                    rural_votes, has_rural)
+    return has_urban & has_rural
+
+def demographic_records(totals):
+    """Convert a frame of demographic totals to records with percentages, leaving out undefined ones."""
+    complete = add_demographic_percentages(totals)
+    records = totals.to_dict(orient='records')
+    for i in np.flatnonzero(~complete):
+        records[i] = {k: v for k, v in records[i].items() if pd.notna(v)}
+    return records
+
+def build_demographic_payload(df):
+    """Compute national and per-county demographic totals and percentages from the attendance data."""
+    # Calculate national totals
+    national_totals = column_totals(df, ['votes_cast'] + BASIC_DEMOGRAPHIC_COLUMNS)
+    national_totals['total_votes'] = national_totals.pop('votes_cast')
+    
+    # Check if urban/rural data already exists in the CSV
+    has_urban_rural_data = all(col in df.columns for col in URBAN_RURAL_COLUMNS)
+    
+    # Files written by update_data already include the estimates; compute them here for attendance
+    # data that was produced some other way
+    if not has_urban_rural_data:
+        df = add_urban_rural_estimates(df)
+        
+        # Now we have the urban/rural data available
+        has_urban_rural_data = True
+    
+    # Calculate national totals
+    national_totals.update(column_totals(df, URBAN_RURAL_COLUMNS))
+    
+    # National percentages use the same computation as the counties, on a single row of totals
+    national_totals = demographic_records(pd.DataFrame([national_totals]))[0]
+    
+    # Get county level demographic data, computing each percentage for all counties at once
+    county_df = df[['county', 'votes_cast'] + BASIC_DEMOGRAPHIC_COLUMNS + URBAN_RURAL_COLUMNS].rename(
+        columns={'votes_cast': 'total_votes'})
+    county_demographics = demographic_records(county_df)
+    
+    # Get last update timestamp
+    last_update = df['timestamp'].iloc[0] if not df.empty else "Unknown"
+    
+    return {
+        "national": national_totals,
+        "counties": county_demographics,
+        "last_update": last_update,
+        "has_urban_rural_data": has_urban_rural_data
+    }
+
 @app.route('/demographic', methods=['GET'])
 def get_demographic():
     try:
@@ -210,188 +514,19 @@ def get_demographic():
         if not os.path.exists(csv_path):
             return jsonify({"error": "Demographic data not available"}), 404
         
+        # Take the version before loading: the frame is then never older than the version its
+        # payload is cached under (a newer frame only causes one extra rebuild)
+        version = os.stat(csv_path).st_mtime_ns
+        
         # Read attendance data which includes demographic information
-        df = pd.read_csv(csv_path)
+        df = load_data(csv_path)
         
         # Check if essential demographic columns exist
-        basic_demographic_columns = ['male_voters', 'female_voters', 'age_18_24', 'age_25_34', 
-                              'age_35_44', 'age_45_64', 'age_65_plus', 'urban_stations', 'rural_stations']
-        
-        if not all(col in df.columns for col in basic_demographic_columns):
+        if not all(col in df.columns for col in BASIC_DEMOGRAPHIC_COLUMNS):
             return jsonify({"error": "Basic demographic data columns missing in attendance data"}), 404
         
-        # Calculate national totals and convert numpy types to native Python types
-        national_totals = {
-            'total_votes': int(df['votes_cast'].sum()),
-            'male_voters': int(df['male_voters'].sum()),
-            'female_voters': int(df['female_voters'].sum()),
-            'age_18_24': int(df['age_18_24'].sum()),
-            'age_25_34': int(df['age_25_34'].sum()),
-            'age_35_44': int(df['age_35_44'].sum()),
-            'age_45_64': int(df['age_45_64'].sum()),
-            'age_65_plus': int(df['age_65_plus'].sum()),
-            'urban_stations': int(df['urban_stations'].sum()),
-            'rural_stations': int(df['rural_stations'].sum()),
-        }
-        
-        # Define urban/rural columns we need
-        urban_rural_columns = ['urban_votes', 'rural_votes',
-                               'urban_male_voters', 'urban_female_voters',
-                               'rural_male_voters', 'rural_female_voters',
-                               'urban_age_18_24', 'urban_age_25_34', 'urban_age_35_44', 
-                               'urban_age_45_64', 'urban_age_65_plus',
-                               'rural_age_18_24', 'rural_age_25_34', 'rural_age_35_44', 
-                               'rural_age_45_64', 'rural_age_65_plus']
-        
-        # Check if urban/rural data already exists in the CSV
-        has_urban_rural_data = all(col in df.columns for col in urban_rural_columns)
-        
-        # If data doesn't exist, we'll estimate it based on station counts
-        if not has_urban_rural_data:
-            # Calculate estimated urban/rural votes based on station counts
-            total_stations = df['urban_stations'] + df['rural_stations']
-            df['urban_votes'] = (df['votes_cast'] * df['urban_stations'] / total_stations).round().fillna(0).astype(int)
-            df['rural_votes'] = (df['votes_cast'] * df['rural_stations'] / total_stations).round().fillna(0).astype(int)
-            
-            # Calculate estimated urban/rural gender data
-            df['urban_male_voters'] = (df['male_voters'] * df['urban_votes'] / df['votes_cast']).round().fillna(0).astype(int)
-            df['urban_female_voters'] = (df['female_voters'] * df['urban_votes'] / df['votes_cast']).round().fillna(0).astype(int)
-            df['rural_male_voters'] = (df['male_voters'] * df['rural_votes'] / df['votes_cast']).round().fillna(0).astype(int)
-            df['rural_female_voters'] = (df['female_voters'] * df['rural_votes'] / df['votes_cast']).round().fillna(0).astype(int)
-            
-            # Calculate estimated urban/rural age data
-            for age_group in ['age_18_24', 'age_25_34', 'age_35_44', 'age_45_64', 'age_65_plus']:
-                df[f'urban_{age_group}'] = (df[age_group] * df['urban_votes'] / df['votes_cast']).round().fillna(0).astype(int)
-                df[f'rural_{age_group}'] = (df[age_group] * df['rural_votes'] / df['votes_cast']).round().fillna(0).astype(int)
-            
-            # Now we have the urban/rural data available
-            has_urban_rural_data = True
-        
-        # Calculate national totals
-        urban_rural_totals = {col: int(df[col].sum()) for col in urban_rural_columns}
-        national_totals.update(urban_rural_totals)
-        
-        # Calculate percentages
-        total_votes = national_totals['total_votes']
-        if total_votes > 0:
-            # Basic demographic percentages
-            national_totals['male_percentage'] = round(national_totals['male_voters'] / total_votes * 100, 1)
-            national_totals['female_percentage'] = round(national_totals['female_voters'] / total_votes * 100, 1)
-            national_totals['age_18_24_percentage'] = round(national_totals['age_18_24'] / total_votes * 100, 1)
-            national_totals['age_25_34_percentage'] = round(national_totals['age_25_34'] / total_votes * 100, 1)
-            national_totals['age_35_44_percentage'] = round(national_totals['age_35_44'] / total_votes * 100, 1)
-            national_totals['age_45_64_percentage'] = round(national_totals['age_45_64'] / total_votes * 100, 1)
-            national_totals['age_65_plus_percentage'] = round(national_totals['age_65_plus'] / total_votes * 100, 1)
-            
-            # Urban/rural percentages if available
-            if has_urban_rural_data:
-                # Overall urban/rural split
-                national_totals['urban_percentage'] = round(national_totals['urban_votes'] / total_votes * 100, 1)
-                national_totals['rural_percentage'] = round(national_totals['rural_votes'] / total_votes * 100, 1)
-                
-                # Gender percentages within urban
-                if national_totals['urban_votes'] > 0:
-                    national_totals['urban_male_percentage'] = round(national_totals['urban_male_voters'] / national_totals['urban_votes'] * 100, 1)
-                    national_totals['urban_female_percentage'] = round(national_totals['urban_female_voters'] / national_totals['urban_votes'] * 100, 1)
-                
-                # Gender percentages within rural
-                if national_totals['rural_votes'] > 0:
-                    national_totals['rural_male_percentage'] = round(national_totals['rural_male_voters'] / national_totals['rural_votes'] * 100, 1)
-                    national_totals['rural_female_percentage'] = round(national_totals['rural_female_voters'] / national_totals['rural_votes'] * 100, 1)
-                
-                # Age percentages within urban
-                if national_totals['urban_votes'] > 0:
-                    national_totals['urban_age_18_24_percentage'] = round(national_totals['urban_age_18_24'] / national_totals['urban_votes'] * 100, 1)
-                    national_totals['urban_age_25_34_percentage'] = round(national_totals['urban_age_25_34'] / national_totals['urban_votes'] * 100, 1)
-                    national_totals['urban_age_35_44_percentage'] = round(national_totals['urban_age_35_44'] / national_totals['urban_votes'] * 100, 1)
-                    national_totals['urban_age_45_64_percentage'] = round(national_totals['urban_age_45_64'] / national_totals['urban_votes'] * 100, 1)
-                    national_totals['urban_age_65_plus_percentage'] = round(national_totals['urban_age_65_plus'] / national_totals['urban_votes'] * 100, 1)
-                
-                # Age percentages within rural
-                if national_totals['rural_votes'] > 0:
-                    national_totals['rural_age_18_24_percentage'] = round(national_totals['rural_age_18_24'] / national_totals['rural_votes'] * 100, 1)
-                    national_totals['rural_age_25_34_percentage'] = round(national_totals['rural_age_25_34'] / national_totals['rural_votes'] * 100, 1)
-                    national_totals['rural_age_35_44_percentage'] = round(national_totals['rural_age_35_44'] / national_totals['rural_votes'] * 100, 1)
-                    national_totals['rural_age_45_64_percentage'] = round(national_totals['rural_age_45_64'] / national_totals['rural_votes'] * 100, 1)
-                    national_totals['rural_age_65_plus_percentage'] = round(national_totals['rural_age_65_plus'] / national_totals['rural_votes'] * 100, 1)
-        
-        # Get county level demographic data
-        county_demographics = []
-        for _, row in df.iterrows():
-            county_votes = int(row['votes_cast'])
-            county_data = {
-                'county': row['county'],
-                'total_votes': county_votes,
-                'male_voters': int(row['male_voters']),
-                'female_voters': int(row['female_voters']),
-                'age_18_24': int(row['age_18_24']),
-                'age_25_34': int(row['age_25_34']),
-                'age_35_44': int(row['age_35_44']),
-                'age_45_64': int(row['age_45_64']),
-                'age_65_plus': int(row['age_65_plus']),
-                'urban_stations': int(row['urban_stations']),
-                'rural_stations': int(row['rural_stations'])
-            }
-            
-            # Add county level urban/rural data
-            if has_urban_rural_data:
-                urban_rural_data = {col: int(row[col]) for col in urban_rural_columns}
-                county_data.update(urban_rural_data)
-            
-            # Calculate percentages for this county
-            if county_votes > 0:
-                # Basic demographic percentages
-                county_data['male_percentage'] = round(county_data['male_voters'] / county_votes * 100, 1)
-                county_data['female_percentage'] = round(county_data['female_voters'] / county_votes * 100, 1)
-                county_data['age_18_24_percentage'] = round(county_data['age_18_24'] / county_votes * 100, 1)
-                county_data['age_25_34_percentage'] = round(county_data['age_25_34'] / county_votes * 100, 1)
-                county_data['age_35_44_percentage'] = round(county_data['age_35_44'] / county_votes * 100, 1)
-                county_data['age_45_64_percentage'] = round(county_data['age_45_64'] / county_votes * 100, 1)
-                county_data['age_65_plus_percentage'] = round(county_data['age_65_plus'] / county_votes * 100, 1)
-                
-                # Urban/rural percentages if available
-                if has_urban_rural_data:
-                    # Overall urban/rural split for county
-                    county_data['urban_percentage'] = round(county_data['urban_votes'] / county_votes * 100, 1)
-                    county_data['rural_percentage'] = round(county_data['rural_votes'] / county_votes * 100, 1)
-                    
-                    # Gender percentages within urban
-                    if county_data['urban_votes'] > 0:
-                        county_data['urban_male_percentage'] = round(county_data['urban_male_voters'] / county_data['urban_votes'] * 100, 1)
-                        county_data['urban_female_percentage'] = round(county_data['urban_female_voters'] / county_data['urban_votes'] * 100, 1)
-                    
-                    # Gender percentages within rural
-                    if county_data['rural_votes'] > 0:
-                        county_data['rural_male_percentage'] = round(county_data['rural_male_voters'] / county_data['rural_votes'] * 100, 1)
-                        county_data['rural_female_percentage'] = round(county_data['rural_female_voters'] / county_data['rural_votes'] * 100, 1)
-                    
-                    # Age percentages within urban
-                    if county_data['urban_votes'] > 0:
-                        county_data['urban_age_18_24_percentage'] = round(county_data['urban_age_18_24'] / county_data['urban_votes'] * 100, 1)
-                        county_data['urban_age_25_34_percentage'] = round(county_data['urban_age_25_34'] / county_data['urban_votes'] * 100, 1)
-                        county_data['urban_age_35_44_percentage'] = round(county_data['urban_age_35_44'] / county_data['urban_votes'] * 100, 1)
-                        county_data['urban_age_45_64_percentage'] = round(county_data['urban_age_45_64'] / county_data['urban_votes'] * 100, 1)
-                        county_data['urban_age_65_plus_percentage'] = round(county_data['urban_age_65_plus'] / county_data['urban_votes'] * 100, 1)
-                    
-                    # Age percentages within rural
-                    if county_data['rural_votes'] > 0:
-                        county_data['rural_age_18_24_percentage'] = round(county_data['rural_age_18_24'] / county_data['rural_votes'] * 100, 1)
-                        county_data['rural_age_25_34_percentage'] = round(county_data['rural_age_25_34'] / county_data['rural_votes'] * 100, 1)
-                        county_data['rural_age_35_44_percentage'] = round(county_data['rural_age_35_44'] / county_data['rural_votes'] * 100, 1)
-                        county_data['rural_age_45_64_percentage'] = round(county_data['rural_age_45_64'] / county_data['rural_votes'] * 100, 1)
-                        county_data['rural_age_65_plus_percentage'] = round(county_data['rural_age_65_plus'] / county_data['rural_votes'] * 100, 1)
-            
-            county_demographics.append(county_data)
-        
-        # Get last update timestamp
-        last_update = df['timestamp'].iloc[0] if not df.empty else "Unknown"
-        
-        return jsonify({
-            "national": national_totals,
-            "counties": county_demographics,
-            "last_update": last_update,
-            "has_urban_rural_data": has_urban_rural_data
-        })
+        # The payload depends only on the attendance file, so build it once per file version
+        return cached_json_response('demographic', version, lambda: build_demographic_payload(df))
     except Exception as e:
         logger.error(f"Error in get_demographic: {e}")
         return jsonify({"error": str(e)}), 500
@@ -406,12 +541,12 @@ def get_last_update():
         results_timestamp = "Not available"
         
         if os.path.exists(attendance_path):
-            df = pd.read_csv(attendance_path)
+            df = load_data(attendance_path)
             if not df.empty and 'timestamp' in df.columns:
                 attendance_timestamp = df['timestamp'].iloc[0]
         
         if os.path.exists(results_path):
-            df = pd.read_csv(results_path)
+            df = load_data(results_path)
             if not df.empty and 'timestamp' in df.columns:
                 results_timestamp = df['timestamp'].iloc[0]
         
@@ -423,18 +558,12 @@ def get_last_update():
         logger.error(f"Error in get_last_update: {e}")
         return jsonify({"error": str(e)}), 500
 
-@app.route('/trigger/update', methods=['POST'])
-def trigger_update():
+# Held while a background data update runs, so triggers never overlap within a worker
+_UPDATE_LOCK = threading.Lock()
+
+def run_data_update(fresh):
+    """Regenerate the data files off the request thread; releases _UPDATE_LOCK when done."""
     try:
-        # Simple API key check for security (should be improved in production)
-        api_key = request.headers.get('X-API-Key')
-        if not api_key or api_key != os.environ.get('UPDATE_API_KEY', 'your-secure-api-key'):
-            return jsonify({"error": "Unauthorized"}), 401
-        
-        # Check for request parameters
-        data = request.get_json() or {}
-        fresh = data.get('fresh', False)
-        
         if fresh:
             # Look for the presence file
             presence_file = os.path.join(DATA_DIR, 'presence_2024-12-02_07-00.csv')
@@ -447,6 +576,39 @@ def trigger_update():
         else:
             update_existing_data()
         
+        # Drop fitted clustering models and payloads so the next request refits on the new data
+        with _CLUSTER_MODELS_LOCK:
+            _CLUSTER_MODELS.clear()
+        _build_clustered_payload.cache_clear()
+        logger.info("Background data update finished")
+    except Exception as e:
+        logger.error(f"Error in background data update: {e}")
+    finally:
+        _UPDATE_LOCK.release()
+
+@app.route('/trigger/update', methods=['POST'])
+def trigger_update():
+    try:
+        # Simple API key check for security (should be improved in production)
+        api_key = request.headers.get('X-API-Key')
+        if not api_key or api_key != os.environ.get('UPDATE_API_KEY', 'your-secure-api-key'):
+            return jsonify({"error": "Unauthorized"}), 401
+        
+        # Check for request parameters
+        data = request.get_json() or {}
+        fresh = data.get('fresh', False)
+        
+        if not _UPDATE_LOCK.acquire(blocking=False):
+            return jsonify({"error": "A data update is already running"}), 409
+        
+        # The data files are replaced atomically, so requests keep being served from the current
+        # files while the update runs in the background
+        try:
+            threading.Thread(target=run_data_update, args=(fresh,), daemon=True).start()
+        except Exception:
+            _UPDATE_LOCK.release()
+            raise
+        
         return jsonify({
             "message": "Data update triggered successfully",
             "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -469,6 +631,124 @@ def get_original_presence():
         logger.error(f"Error in get_original_presence: {e}")
         return jsonify({"error": str(e)}), 500
 
+@functools.lru_cache(maxsize=8)
+def _build_clustered_payload(presence_file_path, source_mtime, cluster_level, n_clusters):
+    """Cluster the presence data at cluster_level and return the serialized /clustering response.
+    
+    source_mtime is the presence file's st_mtime_ns and only serves as part of the cache key.
+    """
+    demographic_columns = [col for _, col in DEMO_KEYS]
+    group_by_columns = CLUSTER_LEVEL_COLUMNS[cluster_level]
+    df = load_presence(presence_file_path, CLUSTER_INPUT_COLUMNS)
+    
+    # Group data by the specified level and aggregate demographics
+    grouped_df = df.groupby(group_by_columns).agg({
+        'Înscriși pe liste permanente': 'sum',
+        'LP': 'sum',  # Votes cast
+        **{col: 'sum' for col in demographic_columns}
+    }).reset_index()
+    
+    # Filter out rows with zero votes to avoid division by zero
+    grouped_df = grouped_df[grouped_df['LP'] > 0]
+    
+    # If we have too few rows for the requested number of clusters, reduce n_clusters
+    if len(grouped_df) <= n_clusters:
+        n_clusters = max(2, len(grouped_df) - 1)
+        logger.warning(f"Too few data points for requested clusters. Reducing to {n_clusters} clusters.")
+    
+    # Calculate percentages instead of raw numbers for better clustering
+    for col in demographic_columns:
+        grouped_df[f'{col}_pct'] = (grouped_df[col] / grouped_df['LP'] * 100).clip(0, 100)
+    
+    # Prepare data for clustering
+    features = [f'{col}_pct' for col in demographic_columns]
+    
+    # Check for NaN or infinite values and replace them
+    X = grouped_df[features].replace([np.inf, -np.inf], np.nan).fillna(0).values
+    
+    # Safety check for extreme values
+    X = np.clip(X, 0, 100)
+    
+    # Fitting only depends on the presence file and the request parameters, so reuse the
+    # fitted estimators while the file is unchanged
+    model_key = (cluster_level, n_clusters)
+    with _CLUSTER_MODELS_LOCK:
+        cached_models = _CLUSTER_MODELS.get(model_key)
+        if cached_models is not None:
+            _CLUSTER_MODELS.move_to_end(model_key)
+    if cached_models is not None and cached_models[0] == source_mtime:
+        _, scaler, kmeans, pca, projection = cached_models
+        # Apply the fitted scaling and PCA projection directly on the arrays instead of
+        # going through the estimators' transform() validation
+        scale_mean, scale, pca_mean, components_t = projection
+        X_scaled = (X - scale_mean) / scale
+        grouped_df['cluster'] = kmeans.predict(X_scaled)
+        principal_components = (X_scaled - pca_mean) @ components_t
+    else:
+        # Standardize the data
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+        
+        # Perform K-means clustering; a single k-means++ seed is enough for this low-dimensional
+        # percentage data, and Elkan's algorithm skips distances using the triangle inequality
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=1, init='k-means++', algorithm='elkan')
+        grouped_df['cluster'] = kmeans.fit_predict(X_scaled)
+        
+        # Perform PCA for 2D visualization
+        pca = PCA(n_components=2)
+        principal_components = pca.fit_transform(X_scaled)
+        
+        projection = (scaler.mean_, scaler.scale_, pca.mean_, np.ascontiguousarray(pca.components_.T))
+        with _CLUSTER_MODELS_LOCK:
+            _CLUSTER_MODELS[model_key] = (source_mtime, scaler, kmeans, pca, projection)
+            _CLUSTER_MODELS.move_to_end(model_key)
+            while len(_CLUSTER_MODELS) > _CLUSTER_MODELS_MAXSIZE:
+                _CLUSTER_MODELS.popitem(last=False)
+    
+    # Calculate cluster centers in percentage space; orjson serializes the NumPy floats directly
+    cluster_centers = scaler.inverse_transform(kmeans.cluster_centers_)
+    
+    # Rename columns for clarity in response
+    cluster_centers_dict = {
+        i: {f'{key}_pct': value for (key, _), value in zip(DEMO_KEYS, center)}
+        for i, center in enumerate(cluster_centers)
+    }
+    
+    # Add PCA coordinates for 2D visualization
+    grouped_df['pca_x'] = principal_components[:, 0]
+    grouped_df['pca_y'] = principal_components[:, 1]
+    
+    # Prepare response data
+    result = {
+        "cluster_level": cluster_level,
+        "n_clusters": n_clusters,
+        "explained_variance_ratio": pca.explained_variance_ratio_,
+        "cluster_centers": cluster_centers_dict
+    }
+    
+    # Pull the columns out as plain nested lists once (native ints and floats) and build the rows
+    # by position instead of going through a pandas object per row
+    counts_rows = grouped_df[['Înscriși pe liste permanente', 'LP', 'cluster', *demographic_columns]].to_numpy(np.int64).tolist()
+    values_rows = grouped_df[['pca_x', 'pca_y', *features]].to_numpy(np.float64).tolist()
+    label_rows = grouped_df[group_by_columns].to_numpy().tolist()
+    
+    clustered_rows = [
+        {
+            # county, plus town and polling_station at the finer levels
+            **dict(zip(CLUSTER_LABEL_KEYS, labels)),
+            "total_registered": counts[0],
+            "total_votes": counts[1],
+            "cluster": counts[2],
+            "pca_x": values[0],
+            "pca_y": values[1],
+            "demographics": dict(zip(DEMO_OUTPUT_KEYS, counts[3:])),
+            "demographics_pct": dict(zip(DEMO_OUTPUT_KEYS, values[2:]))
+        }
+        for labels, counts, values in zip(label_rows, counts_rows, values_rows)
+    ]
+    
+    return dumps_json({**result, "clustered_data": clustered_rows})
+
 @app.route('/clustering', methods=['GET'])
 def get_clustering():
     try:
@@ -484,14 +764,10 @@ def get_clustering():
         
         logger.info(f"Using presence file for clustering: {presence_file_path}")
         
-        # Read presence data (with comment handling for any file header comments)
-        df = pd.read_csv(presence_file_path, comment='//', engine='python')
-        
-        # Demographic columns to use for clustering
-        demographic_columns = [
-            'Barbati 18-24', 'Barbati 25-34', 'Barbati 35-44', 'Barbati 45-64', 'Barbati 65+',
-            'Femei 18-24', 'Femei 25-34', 'Femei 35-44', 'Femei 45-64', 'Femei 65+'
-        ]
+        # Read presence data (with comment handling for any file header comments), keeping only the
+        # columns used for clustering
+        demographic_columns = [col for _, col in DEMO_KEYS]
+        df = load_presence(presence_file_path, CLUSTER_INPUT_COLUMNS)
         
         # Check if all demographic columns exist
         if not all(col in df.columns for col in demographic_columns):
@@ -501,197 +777,14 @@ def get_clustering():
         cluster_level = request.args.get('level', 'county').lower()
         n_clusters = int(request.args.get('n_clusters', 5))
         
-        # Define unique identifiers based on cluster level
-        if cluster_level == 'county':
-            group_by_columns = ['Judet']
-        elif cluster_level == 'town':
-            group_by_columns = ['Judet', 'Localitate']
-        elif cluster_level == 'polling':
-            group_by_columns = ['Judet', 'Localitate', 'Nume sectie de votare']
-        else:
+        if cluster_level not in CLUSTER_LEVEL_COLUMNS:
             return jsonify({"error": f"Invalid clustering level: {cluster_level}. Must be one of: county, town, polling"}), 400
         
-        # Group data by the specified level and aggregate demographics
-        grouped_df = df.groupby(group_by_columns).agg({
-            'Înscriși pe liste permanente': 'sum',
-            'LP': 'sum',  # Votes cast
-            **{col: 'sum' for col in demographic_columns}
-        }).reset_index()
-        
-        # Filter out rows with zero votes to avoid division by zero
-        grouped_df = grouped_df[grouped_df['LP'] > 0]
-        
-        # If we have too few rows for the requested number of clusters, reduce n_clusters
-        if len(grouped_df) <= n_clusters:
-            n_clusters = max(2, len(grouped_df) - 1)
-            logger.warning(f"Too few data points for requested clusters. Reducing to {n_clusters} clusters.")
-        
-        # Calculate percentages instead of raw numbers for better clustering
-        for col in demographic_columns:
-            grouped_df[f'{col}_pct'] = (grouped_df[col] / grouped_df['LP'] * 100).clip(0, 100)
-        
-        # Prepare data for clustering
-        features = [f'{col}_pct' for col in demographic_columns]
-        
-        # Check for NaN or infinite values and replace them
-        X = grouped_df[features].replace([np.inf, -np.inf], np.nan).fillna(0).values
-        
-        # Safety check for extreme values
-        X = np.clip(X, 0, 100)
-        
-        # Standardize the data
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-        
-        # Perform K-means clustering
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        grouped_df['cluster'] = kmeans.fit_predict(X_scaled)
-        
-        # Calculate cluster centers
-        cluster_centers = pd.DataFrame(
-            scaler.inverse_transform(kmeans.cluster_centers_),
-            columns=features
-        )
-        
-        # Rename columns for clarity in response
-        cluster_centers_dict = {}
-        for i, row in cluster_centers.iterrows():
-            cluster_centers_dict[i] = {
-                'male_18_24_pct': float(row['Barbati 18-24_pct']),
-                'male_25_34_pct': float(row['Barbati 25-34_pct']),
-                'male_35_44_pct': float(row['Barbati 35-44_pct']),
-                'male_45_64_pct': float(row['Barbati 45-64_pct']),
-                'male_65_plus_pct': float(row['Barbati 65+_pct']),
-                'female_18_24_pct': float(row['Femei 18-24_pct']),
-                'female_25_34_pct': float(row['Femei 25-34_pct']),
-                'female_35_44_pct': float(row['Femei 35-44_pct']),
-                'female_45_64_pct': float(row['Femei 45-64_pct']),
-                'female_65_plus_pct': float(row['Femei 65+_pct']),
-            }
-        
-        # Perform PCA for 2D visualization
-        pca = PCA(n_components=2)
-        principal_components = pca.fit_transform(X_scaled)
-        grouped_df['pca_x'] = principal_components[:, 0]
-        grouped_df['pca_y'] = principal_components[:, 1]
-        
-        # Prepare response data
-        result = {
-            "cluster_level": cluster_level,
-            "n_clusters": n_clusters,
-            "explained_variance_ratio": pca.explained_variance_ratio_.tolist(),
-            "cluster_centers": cluster_centers_dict,
-            "clustered_data": []
-        }
-        
-        # Add clustered data based on the level
-        if cluster_level == 'county':
-            for _, row in grouped_df.iterrows():
-                result["clustered_data"].append({
-                    "county": row['Judet'],
-                    "total_registered": int(row['Înscriși pe liste permanente']),
-                    "total_votes": int(row['LP']),
-                    "cluster": int(row['cluster']),
-                    "pca_x": float(row['pca_x']),
-                    "pca_y": float(row['pca_y']),
-                    "demographics": {
-                        "male_18_24": int(row['Barbati 18-24']),
-                        "male_25_34": int(row['Barbati 25-34']),
-                        "male_35_44": int(row['Barbati 35-44']),
-                        "male_45_64": int(row['Barbati 45-64']),
-                        "male_65_plus": int(row['Barbati 65+']),
-                        "female_18_24": int(row['Femei 18-24']),
-                        "female_25_34": int(row['Femei 25-34']),
-                        "female_35_44": int(row['Femei 35-44']),
-                        "female_45_64": int(row['Femei 45-64']),
-                        "female_65_plus": int(row['Femei 65+'])
-                    },
-                    "demographics_pct": {
-                        "male_18_24": float(row['Barbati 18-24_pct']),
-                        "male_25_34": float(row['Barbati 25-34_pct']),
-                        "male_35_44": float(row['Barbati 35-44_pct']),
-                        "male_45_64": float(row['Barbati 45-64_pct']),
-                        "male_65_plus": float(row['Barbati 65+_pct']),
-                        "female_18_24": float(row['Femei 18-24_pct']),
-                        "female_25_34": float(row['Femei 25-34_pct']),
-                        "female_35_44": float(row['Femei 35-44_pct']),
-                        "female_45_64": float(row['Femei 45-64_pct']),
-                        "female_65_plus": float(row['Femei 65+_pct'])
-                    }
-                })
-        elif cluster_level == 'town':
-            for _, row in grouped_df.iterrows():
-                result["clustered_data"].append({
-                    "county": row['Judet'],
-                    "town": row['Localitate'],
-                    "total_registered": int(row['Înscriși pe liste permanente']),
-                    "total_votes": int(row['LP']),
-                    "cluster": int(row['cluster']),
-                    "pca_x": float(row['pca_x']),
-                    "pca_y": float(row['pca_y']),
-                    "demographics": {
-                        "male_18_24": int(row['Barbati 18-24']),
-                        "male_25_34": int(row['Barbati 25-34']),
-                        "male_35_44": int(row['Barbati 35-44']),
-                        "male_45_64": int(row['Barbati 45-64']),
-                        "male_65_plus": int(row['Barbati 65+']),
-                        "female_18_24": int(row['Femei 18-24']),
-                        "female_25_34": int(row['Femei 25-34']),
-                        "female_35_44": int(row['Femei 35-44']),
-                        "female_45_64": int(row['Femei 45-64']),
-                        "female_65_plus": int(row['Femei 65+'])
-                    },
-                    "demographics_pct": {
-                        "male_18_24": float(row['Barbati 18-24_pct']),
-                        "male_25_34": float(row['Barbati 25-34_pct']),
-                        "male_35_44": float(row['Barbati 35-44_pct']),
-                        "male_45_64": float(row['Barbati 45-64_pct']),
-                        "male_65_plus": float(row['Barbati 65+_pct']),
-                        "female_18_24": float(row['Femei 18-24_pct']),
-                        "female_25_34": float(row['Femei 25-34_pct']),
-                        "female_35_44": float(row['Femei 35-44_pct']),
-                        "female_45_64": float(row['Femei 45-64_pct']),
-                        "female_65_plus": float(row['Femei 65+_pct'])
-                    }
-                })
-        else:  # polling level
-            for _, row in grouped_df.iterrows():
-                result["clustered_data"].append({
-                    "county": row['Judet'],
-                    "town": row['Localitate'],
-                    "polling_station": row['Nume sectie de votare'],
-                    "total_registered": int(row['Înscriși pe liste permanente']),
-                    "total_votes": int(row['LP']),
-                    "cluster": int(row['cluster']),
-                    "pca_x": float(row['pca_x']),
-                    "pca_y": float(row['pca_y']),
-                    "demographics": {
-                        "male_18_24": int(row['Barbati 18-24']),
-                        "male_25_34": int(row['Barbati 25-34']),
-                        "male_35_44": int(row['Barbati 35-44']),
-                        "male_45_64": int(row['Barbati 45-64']),
-                        "male_65_plus": int(row['Barbati 65+']),
-                        "female_18_24": int(row['Femei 18-24']),
-                        "female_25_34": int(row['Femei 25-34']),
-                        "female_35_44": int(row['Femei 35-44']),
-                        "female_45_64": int(row['Femei 45-64']),
-                        "female_65_plus": int(row['Femei 65+'])
-                    },
-                    "demographics_pct": {
-                        "male_18_24": float(row['Barbati 18-24_pct']),
-                        "male_25_34": float(row['Barbati 25-34_pct']),
-                        "male_35_44": float(row['Barbati 35-44_pct']),
-                        "male_45_64": float(row['Barbati 45-64_pct']),
-                        "male_65_plus": float(row['Barbati 65+_pct']),
-                        "female_18_24": float(row['Femei 18-24_pct']),
-                        "female_25_34": float(row['Femei 25-34_pct']),
-                        "female_35_44": float(row['Femei 35-44_pct']),
-                        "female_45_64": float(row['Femei 45-64_pct']),
-                        "female_65_plus": float(row['Femei 65+_pct'])
-                    }
-                })
-        
-        return jsonify(result)
+        # The payload only depends on the request parameters and the presence file, so it is
+        # cached per file version and served as-is
+        payload = _build_clustered_payload(presence_file_path, os.stat(presence_file_path).st_mtime_ns,
+                                           cluster_level, n_clusters)
+        return Response(payload, mimetype='application/json')
     
     except Exception as e:
         logger.error(f"Error in get_clustering: {e}")
@@ -721,5 +814,14 @@ if __name__ == "__main__":
             logger.info("Generating random results data.")
             generate_results_data()
     
-    # Run the Flask app
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Run the Flask app; the debug server (reloader, debugger) only when FLASK_DEBUG is set
+    if os.environ.get('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes'):
+        app.run(host='0.0.0.0', port=5000, debug=True)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.info("waitress is not installed, using Flask's threaded server; use ./run.sh (gunicorn) in production")
+            app.run(host='0.0.0.0', port=5000, threaded=True)
+        else:
+            serve(app, host='0.0.0.0', port=5000, threads=8)
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for the Romanian Elections 2025 API
+
+Usage: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# /clustering and /demographic are CPU-bound (KMeans fits, pandas work), so the default is
+# plain sync workers, two per core, letting a long fit block only its own worker.
+# For mostly I/O-bound traffic set WORKER_CLASS=gevent (requires the gevent package).
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2))
+worker_class = os.environ.get('WORKER_CLASS', 'sync')
+worker_connections = 1000
+
+# KMeans fits on polling-station data can take a while on a cold cache
+timeout = 120
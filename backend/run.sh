@@ -13,6 +13,6 @@ source ../.venv/bin/activate
 echo "Installing requirements..."
 pip install -r requirements.txt
 
-# Run the Flask application
+# Run the Flask application with gunicorn (settings in gunicorn.conf.py)
 echo "Starting Flask server..."
-flask run --host=0.0.0.0 --port=5000
\ No newline at end of file
+gunicorn -c gunicorn.conf.py app:app
\ No newline at end of file
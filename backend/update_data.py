@@ -8,12 +8,16 @@ for the election dashboard.
 """
 
 import os
+import glob
 import pandas as pd
 import numpy as np
-import random
+import pyarrow as pa
+from pyarrow import csv as pacsv, feather
 import shutil
 import argparse
+import csv
 import time
+import threading
 from datetime import datetime
 
 # Path to data directory
@@ -42,12 +46,83 @@ COUNTY_NAME_MAP["BISTRITA NASAUD"] = "Bistrita-Nasaud"
 COUNTY_NAME_MAP["SATU-MARE"] = "Satu Mare"
 # Add more mappings based on expected variations in your source 'Judet' column
 
-def get_full_county_name(name):
-    """Maps a potentially abbreviated/varied county name to its full name."""
-    if pd.isna(name):
-        return "Unknown" # Handle missing names
-    # Convert to string, uppercase, strip whitespace, and lookup
-    return COUNTY_NAME_MAP.get(str(name).upper().strip(), str(name).strip()) # Return cleaned original if no map found
+# Age group columns of the attendance data
+AGE_GROUP_COLUMNS = ['age_18_24', 'age_25_34', 'age_35_44', 'age_45_64', 'age_65_plus']
+
+# Columns add_urban_rural_estimates derives the urban/rural estimates from
+ESTIMATE_SOURCE_COLUMNS = ['votes_cast', 'urban_stations', 'rural_stations', 'male_voters', 'female_voters'] + AGE_GROUP_COLUMNS
+
+def add_urban_rural_estimates(df):
+    """Return df with urban_*/rural_* vote, gender and age columns estimated from the station counts.
+
+    Each county's votes are split in proportion to its urban/rural station counts, and its gender and
+    age counts follow the same split. Existing estimate columns are recomputed.
+    """
+    # Every estimate is a count column scaled by a per-county share, so compute the
+    # shares once and apply them with NumPy on the raw arrays
+    def estimate(counts, share):
+        # Shares are undefined where a county has no stations or no votes; estimate 0 there
+        return np.nan_to_num(np.rint(counts * share), nan=0, posinf=0, neginf=0).astype(np.int64)
+
+    votes = df['votes_cast'].to_numpy(dtype=np.float64)
+    urban_stations = df['urban_stations'].to_numpy(dtype=np.float64)
+    rural_stations = df['rural_stations'].to_numpy(dtype=np.float64)
+    estimates = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Calculate estimated urban/rural votes based on station counts
+        total_stations = urban_stations + rural_stations
+        estimates['urban_votes'] = estimate(votes, urban_stations / total_stations)
+        estimates['rural_votes'] = estimate(votes, rural_stations / total_stations)
+        urban_share = estimates['urban_votes'] / votes
+        rural_share = estimates['rural_votes'] / votes
+
+        # Calculate estimated urban/rural gender and age data
+        for base in ['male_voters', 'female_voters'] + AGE_GROUP_COLUMNS:
+            counts = df[base].to_numpy(dtype=np.float64)
+            estimates[f'urban_{base}'] = estimate(counts, urban_share)
+            estimates[f'rural_{base}'] = estimate(counts, rural_share)
+
+    df = df.assign(**estimates)
+    # Keep the timestamp as the last column of the saved files
+    if 'timestamp' in df.columns:
+        df = df[[col for col in df.columns if col != 'timestamp'] + ['timestamp']]
+    return df
+
+def write_atomically(path, write):
+    """Call write(tmp_path), then move the finished file over path so readers never see a partial file."""
+    # Unique per process and thread, so concurrent writers of the same path never share a temp file.
+    # Unlike a tempfile.mkstemp file it gets the usual umask permissions, which os.replace keeps.
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def csv_source_key(csv_path):
+    """Identify the current version of a CSV file by its mtime and size, as recorded in its Feather copy."""
+    stat = os.stat(csv_path)
+    return f'{stat.st_mtime_ns}:{stat.st_size}'.encode()
+
+def save_data(df, csv_path):
+    """Write df to csv_path, plus a Feather copy next to it that the API reads in preference to the CSV."""
+    # Convert to Arrow once and let pyarrow's multithreaded writers produce both files
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as arrow_err:
+        print(f"Could not convert data for {csv_path} to Arrow, writing it with pandas: {arrow_err}")
+        write_atomically(csv_path, lambda tmp_path: df.to_csv(tmp_path, index=False))
+        return
+    # The CSV is replaced first: until the matching Feather copy lands, the API reads the new CSV
+    write_atomically(csv_path, lambda tmp_path: pacsv.write_csv(table, tmp_path))
+    feather_path = os.path.splitext(csv_path)[0] + '.feather'
+    try:
+        # Record the CSV version so readers ignore this copy once the CSV is replaced by other means
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'source': csv_source_key(csv_path)})
+        write_atomically(feather_path, lambda tmp_path: feather.write_feather(table, tmp_path))
+    except Exception as feather_err:
+        print(f"Could not write Feather copy {feather_path}: {feather_err}")
 
 def process_presence_data(source_file=None):
     """Process detailed presence data, mapping 'Judet' to full county names using correct headers."""
@@ -60,10 +135,6 @@ def process_presence_data(source_file=None):
         return generate_attendance_data()
 
     try:
-        print(f"Attempting to read CSV: {source_file}")
-        df = pd.read_csv(source_file)
-        print(f"Successfully read CSV. Columns found: {list(df.columns)}")
-
         # --- Define Expected Column Names based on presence_2024-11-25_07-00.csv ---
         judet_col = 'Judet'
         total_voters_col = 'Înscriși pe liste permanente' # Corrected
@@ -86,6 +157,22 @@ def process_presence_data(source_file=None):
         station_id_col = 'Nr sectie de votare' # Corrected
         # --- End Define Expected Column Names ---
 
+        print(f"Attempting to read CSV: {source_file}")
+        # Read the header first so only the columns used below are parsed out of the ~230 in the file
+        with open(source_file, newline='', encoding='utf-8-sig') as f:
+            header = next(csv.reader(f), [])
+        if not header:
+            raise pd.errors.EmptyDataError("No columns to parse from file")
+        used_cols = [judet_col, total_voters_col, votes_cast_col, station_type_col, station_id_col,
+                     *male_age_cols_src, *female_age_cols_src]
+        table = pacsv.read_csv(
+            source_file,
+            convert_options=pacsv.ConvertOptions(include_columns=[col for col in used_cols if col in header],
+                                                 strings_can_be_null=True)
+        )
+        df = table.to_pandas()
+        print(f"Successfully read CSV. Columns found: {header}")
+
         # --- Start Column Validation ---
         # Check for essential columns needed for basic aggregation
         required_cols_for_processing = [judet_col, total_voters_col, votes_cast_col]
@@ -101,89 +188,76 @@ def process_presence_data(source_file=None):
              print(f"  Essential columns expected: {judet_col}, {total_voters_col}, {votes_cast_col}")
              print(f"  Also expected age/gender columns like: {all_age_gender_cols[:3]}... etc.")
              print(f"  Missing columns found: {missing_cols}")
-             print(f"  Columns found in file: {list(df.columns)}")
+             print(f"  Columns found in file: {header}")
              print("Cannot process this file. Falling back to generating random data.")
              return generate_attendance_data() # Fallback
 
-        # Apply mapping to create a new column with full names
-        df['Judet_Full'] = df[judet_col].apply(get_full_county_name)
+        # Apply mapping to create a new column with full names: names are matched case-insensitively
+        # after stripping whitespace, unmatched names are kept (cleaned) and missing ones become "Unknown"
+        cleaned_names = df[judet_col].astype('string').str.strip()
+        df['Judet_Full'] = cleaned_names.str.upper().map(COUNTY_NAME_MAP).fillna(cleaned_names).fillna('Unknown')
         # --- End Column Validation and County Name Mapping ---
 
-        county_data = []
-        grouped = df.groupby('Judet_Full')
+        # Drop rows whose county name could not be resolved
+        invalid = df['Judet_Full'].isin(['', 'Unknown'])
+        for original_name in df.loc[invalid].drop_duplicates('Judet_Full')[judet_col]:
+            print(f"Skipping group with invalid/unknown county name derived from source: {original_name}")
+        df = df.loc[~invalid]
+        # Group on the integer codes of a categorical instead of hashing every county string
+        df['Judet_Full'] = df['Judet_Full'].astype('category')
+
+        # Coerce the count columns once, before grouping, so non-numeric cells are skipped by the sums;
+        # columns that were already parsed as numbers need no conversion
+        for col in [total_voters_col, votes_cast_col] + all_age_gender_cols:
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
 
         print(f"Processing data grouped by full county names...")
-        for county_full_name, county_df in grouped:
-            if not county_full_name or county_full_name == "Unknown":
-                original_name = county_df[judet_col].iloc[0] if not county_df.empty else 'N/A'
-                print(f"Skipping group with invalid/unknown county name derived from source: {original_name}")
-                continue
-
-            # Aggregate essential data
-            total_voters = county_df[total_voters_col].sum()
-            votes_cast = county_df[votes_cast_col].sum()
-            attendance_percentage = (votes_cast / total_voters * 100) if total_voters > 0 else 0
-
-            # Helper to safely sum multiple columns
-            def safe_sum_multiple(cols_to_sum):
-                total = 0
-                for col in cols_to_sum:
-                    if col in county_df.columns:
-                        # Sum only numeric, non-NA values for the column
-                        total += pd.to_numeric(county_df[col], errors='coerce').dropna().sum()
-                return int(total) if pd.notna(total) else None
+        grouped = df.groupby('Judet_Full', observed=True)
+        # Aggregate essential data and the age/gender counts in a single pass; observed categorical
+        # groups come back in order of appearance, so restore the alphabetical county order
+        totals = grouped[[total_voters_col, votes_cast_col] + all_age_gender_cols].sum().sort_index()
 
-            # Calculate total male and female voters by summing age groups
-            male_voters = safe_sum_multiple(male_age_cols_src)
-            female_voters = safe_sum_multiple(female_age_cols_src)
-
-            county_entry = {
-                'county': county_full_name,
-                'total_voters': int(total_voters),
-                'votes_cast': int(votes_cast),
-                'attendance_percentage': round(attendance_percentage, 2),
-                'male_voters': male_voters,
-                'female_voters': female_voters,
-                'timestamp': current_time
-            }
-
-            # Calculate and add age group totals
-            for output_key, source_cols in age_group_cols_src.items():
-                county_entry[output_key] = safe_sum_multiple(source_cols)
-
-            # Calculate urban/rural stations
-            urban_stations = None
-            rural_stations = None
-            if station_type_col in county_df.columns and station_id_col in county_df.columns:
-                 try:
-                     station_types = county_df[station_type_col].astype(str).str.upper().fillna('UNKNOWN')
-                     # Use .loc to avoid SettingWithCopyWarning if county_df is a slice
-                     urban_stations = county_df.loc[station_types == 'U', station_id_col].nunique() # Changed to 'U'
-                     rural_stations = county_df.loc[station_types == 'R', station_id_col].nunique() # Changed to 'R'
-                 except Exception as station_err:
-                     print(f"Warning: Could not calculate urban/rural stations for {county_full_name}: {station_err}")
-
-            county_entry['urban_stations'] = int(urban_stations) if pd.notna(urban_stations) else None
-            county_entry['rural_stations'] = int(rural_stations) if pd.notna(rural_stations) else None
-
-            county_data.append(county_entry)
-
-        if not county_data:
+        if totals.empty:
              print("Warning: No valid county data could be processed from the source file after grouping.")
              return pd.DataFrame()
 
-        # Create DataFrame and save to CSV
-        result_df = pd.DataFrame(county_data)
-        # Reorder columns to ensure 'county' is first, followed by others
-        cols_order = ['county', 'total_voters', 'votes_cast', 'attendance_percentage',
-                      'male_voters', 'female_voters', 'age_18_24', 'age_25_34', 'age_35_44',
-                      'age_45_64', 'age_65_plus', 'urban_stations', 'rural_stations', 'timestamp']
-        # Filter out any columns that might not exist if aggregation failed partially
-        final_cols = [col for col in cols_order if col in result_df.columns]
-        result_df = result_df[final_cols]
+        total_voters = totals[total_voters_col].astype(np.int64)
+        votes_cast = totals[votes_cast_col].astype(np.int64)
+        attendance_percentage = (votes_cast / total_voters * 100).where(total_voters > 0, 0).round(2)
+
+        result_df = pd.DataFrame({
+            'county': totals.index.astype(str),
+            'total_voters': total_voters,
+            'votes_cast': votes_cast,
+            'attendance_percentage': attendance_percentage,
+            # Calculate total male and female voters by summing age groups
+            'male_voters': totals[male_age_cols_src].sum(axis=1).astype(np.int64),
+            'female_voters': totals[female_age_cols_src].sum(axis=1).astype(np.int64),
+            # Calculate age group totals
+            **{output_key: totals[source_cols].sum(axis=1).astype(np.int64)
+               for output_key, source_cols in age_group_cols_src.items()},
+            'urban_stations': None,
+            'rural_stations': None,
+            'timestamp': current_time
+        }).reset_index(drop=True)
+
+        # Calculate urban/rural stations as the distinct station ids per county and station type
+        if station_type_col in df.columns and station_id_col in df.columns:
+             try:
+                 station_types = df[station_type_col].astype(str).str.upper().astype('category')
+                 stations = (df.groupby(['Judet_Full', station_types], observed=True)[station_id_col]
+                             .nunique().unstack(fill_value=0))
+                 stations = stations.reindex(index=totals.index, columns=['U', 'R'], fill_value=0)
+                 result_df['urban_stations'] = stations['U'].to_numpy()
+                 result_df['rural_stations'] = stations['R'].to_numpy()
+             except Exception as station_err:
+                 print(f"Warning: Could not calculate urban/rural stations: {station_err}")
+
+        result_df = add_urban_rural_estimates(result_df)
 
         csv_path = os.path.join(DATA_DIR, 'attendance.csv')
-        result_df.to_csv(csv_path, index=False)
+        save_data(result_df, csv_path)
         print(f"Processed presence data using correct headers and saved attendance data to {csv_path} at {current_time}")
 
         # Save a timestamped copy of the original file
@@ -192,8 +266,18 @@ def process_presence_data(source_file=None):
             safe_source_filename = "".join(c if c.isalnum() else "_" for c in source_filename)
             timestamped_source_path = os.path.join(DATA_DIR, f"processed_{safe_source_filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
             if not source_filename.startswith('processed_'):
-                 shutil.copy2(source_file, timestamped_source_path)
-                 print(f"Copied source file to {timestamped_source_path}")
+                 # copy2 keeps the source's size and mtime, so an unchanged source already has its copy.
+                 # A copy sharing the source's inode (a hard link) changes with it and never counts.
+                 source_stat = os.stat(source_file)
+                 previous_copies = sorted(glob.glob(os.path.join(DATA_DIR, f"processed_{glob.escape(safe_source_filename)}_*.csv")))
+                 latest_stat = os.stat(previous_copies[-1]) if previous_copies else None
+                 if (latest_stat
+                         and (latest_stat.st_ino, latest_stat.st_dev) != (source_stat.st_ino, source_stat.st_dev)
+                         and (latest_stat.st_size, latest_stat.st_mtime_ns) == (source_stat.st_size, source_stat.st_mtime_ns)):
+                     print(f"Source file unchanged since {previous_copies[-1]}, not copying it again")
+                 else:
+                     shutil.copy2(source_file, timestamped_source_path)
+                     print(f"Copied source file to {timestamped_source_path}")
         except Exception as copy_err:
             print(f"Could not copy source file: {copy_err}")
 
@@ -217,73 +301,64 @@ def process_presence_data(source_file=None):
 
 def generate_attendance_data():
     """Generate random attendance data for counties using full names"""
-    data = []
     current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    for county in COUNTIES: # Uses the full names list
-        total_voters = random.randint(300000, 2000000)
-        attendance_pct = random.uniform(25.0, 60.0)
-        votes_cast = int(total_voters * (attendance_pct / 100))
-
-        male_ratio = random.uniform(0.45, 0.55)
-        male_voters = int(votes_cast * male_ratio)
-        female_voters = votes_cast - male_voters
-
-        age_18_24 = int(votes_cast * random.uniform(0.05, 0.15))
-        age_25_34 = int(votes_cast * random.uniform(0.15, 0.25))
-        age_35_44 = int(votes_cast * random.uniform(0.15, 0.25))
-        age_45_64 = int(votes_cast * random.uniform(0.25, 0.35))
-        age_65_plus = max(0, votes_cast - age_18_24 - age_25_34 - age_35_44 - age_45_64)
-
-        urban_stations = random.randint(20, 100)
-        rural_stations = random.randint(10, 50)
-
-        data.append({
-            'county': county, # Full name used here
-            'total_voters': total_voters,
-            'votes_cast': votes_cast,
-            'attendance_percentage': round(attendance_pct, 2),
-            'male_voters': male_voters,
-            'female_voters': female_voters,
-            'age_18_24': age_18_24,
-            'age_25_34': age_25_34,
-            'age_35_44': age_35_44,
-            'age_45_64': age_45_64,
-            'age_65_plus': age_65_plus,
-            'urban_stations': urban_stations,
-            'rural_stations': rural_stations,
-            'timestamp': current_time
-        })
-
-    df = pd.DataFrame(data)
+    rng = np.random.default_rng()
+    n = len(COUNTIES)
+
+    # Draw every county's values at once, one column per call
+    total_voters = rng.integers(300000, 2000000, n, endpoint=True)
+    attendance_pct = rng.uniform(25.0, 60.0, n)
+    votes_cast = (total_voters * (attendance_pct / 100)).astype(np.int64)
+
+    male_ratio = rng.uniform(0.45, 0.55, n)
+    male_voters = (votes_cast * male_ratio).astype(np.int64)
+    female_voters = votes_cast - male_voters
+
+    age_18_24 = (votes_cast * rng.uniform(0.05, 0.15, n)).astype(np.int64)
+    age_25_34 = (votes_cast * rng.uniform(0.15, 0.25, n)).astype(np.int64)
+    age_35_44 = (votes_cast * rng.uniform(0.15, 0.25, n)).astype(np.int64)
+    age_45_64 = (votes_cast * rng.uniform(0.25, 0.35, n)).astype(np.int64)
+    age_65_plus = np.maximum(0, votes_cast - age_18_24 - age_25_34 - age_35_44 - age_45_64)
+
+    df = pd.DataFrame({
+        'county': COUNTIES, # Full names used here
+        'total_voters': total_voters,
+        'votes_cast': votes_cast,
+        'attendance_percentage': np.round(attendance_pct, 2),
+        'male_voters': male_voters,
+        'female_voters': female_voters,
+        'age_18_24': age_18_24,
+        'age_25_34': age_25_34,
+        'age_35_44': age_35_44,
+        'age_45_64': age_45_64,
+        'age_65_plus': age_65_plus,
+        'urban_stations': rng.integers(20, 100, n, endpoint=True),
+        'rural_stations': rng.integers(10, 50, n, endpoint=True),
+        'timestamp': current_time
+    })
+
+    df = add_urban_rural_estimates(df)
     csv_path = os.path.join(DATA_DIR, 'attendance.csv')
-    df.to_csv(csv_path, index=False)
+    save_data(df, csv_path)
     print(f"Generated random attendance data using full county names at {current_time}")
     return df
 
 def generate_results_data():
     """Generate random election results data for counties using full names"""
-    data = []
     current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rng = np.random.default_rng()
 
-    for county in COUNTIES: # Uses the full names list
-        results = [random.uniform(5, 35) for _ in range(5)]
-        total = sum(results)
-        results_pct = [(r / total * 100) if total > 0 else 20.0 for r in results] # Handle zero total
-
-        data.append({
-            'county': county, # Full name used here
-            'candidate_1': round(results_pct[0], 2),
-            'candidate_2': round(results_pct[1], 2),
-            'candidate_3': round(results_pct[2], 2),
-            'candidate_4': round(results_pct[3], 2),
-            'candidate_5': round(results_pct[4], 2),
-            'timestamp': current_time
-        })
+    # Five candidate shares per county, normalized to 100% per row
+    results = rng.uniform(5, 35, (len(COUNTIES), 5))
+    results_pct = np.round(results / results.sum(axis=1, keepdims=True) * 100, 2)
 
-    df = pd.DataFrame(data)
+    df = pd.DataFrame({
+        'county': COUNTIES, # Full names used here
+        **{f'candidate_{i + 1}': results_pct[:, i] for i in range(5)},
+        'timestamp': current_time
+    })
     csv_path = os.path.join(DATA_DIR, 'results.csv')
-    df.to_csv(csv_path, index=False)
+    save_data(df, csv_path)
     print(f"Generated random results data using full county names at {current_time}")
     return df
 
@@ -292,6 +367,7 @@ def update_existing_data():
     attendance_path = os.path.join(DATA_DIR, 'attendance.csv')
     results_path = os.path.join(DATA_DIR, 'results.csv')
     current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rng = np.random.default_rng()
     updated_any = False
 
     # Update attendance data
@@ -301,18 +377,24 @@ def update_existing_data():
             if 'county' not in df_attendance.columns or 'total_voters' not in df_attendance.columns or 'votes_cast' not in df_attendance.columns:
                  raise ValueError("Attendance CSV missing required columns.")
 
-            for index, row in df_attendance.iterrows():
-                change_factor = random.uniform(0.005, 0.02)
-                # Ensure new_votes doesn't exceed total_voters and handle potential NaN
-                total_voters = row['total_voters'] if pd.notna(row['total_voters']) else 0
-                votes_cast = row['votes_cast'] if pd.notna(row['votes_cast']) else 0
-                new_votes = min(total_voters, votes_cast + int(total_voters * change_factor))
-
-                df_attendance.loc[index, 'votes_cast'] = new_votes
-                df_attendance.loc[index, 'attendance_percentage'] = round((new_votes / total_voters * 100) if total_voters > 0 else 0, 2)
-                df_attendance.loc[index, 'timestamp'] = current_time
-
-            df_attendance.to_csv(attendance_path, index=False)
+            # Add a random 0.5-2% of the registered voters to every county at once, capped at the
+            # number of registered voters (missing values count as 0)
+            total_voters = df_attendance['total_voters'].fillna(0).to_numpy()
+            votes_cast = df_attendance['votes_cast'].fillna(0).to_numpy()
+            change_factors = rng.uniform(0.005, 0.02, len(df_attendance))
+            new_votes = np.minimum(total_voters, votes_cast + (total_voters * change_factors).astype(np.int64))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                attendance_percentage = np.where(total_voters > 0, np.round(new_votes / total_voters * 100, 2), 0.0)
+
+            df_attendance['votes_cast'] = new_votes
+            df_attendance['attendance_percentage'] = attendance_percentage
+            df_attendance['timestamp'] = current_time
+
+            # Votes changed, so the urban/rural split has to be re-estimated; files without the
+            # station/demographic columns keep their columns (the API estimates at request time)
+            if all(col in df_attendance.columns for col in ESTIMATE_SOURCE_COLUMNS):
+                df_attendance = add_urban_rural_estimates(df_attendance)
+            save_data(df_attendance, attendance_path)
             print(f"Updated existing attendance data at {current_time}")
             updated_any = True
         except Exception as e:
@@ -332,23 +414,19 @@ def update_existing_data():
             if 'county' not in df_results.columns or not all(col in df_results.columns for col in c_cols):
                  raise ValueError("Results CSV missing required columns.")
 
-            for index, row in df_results.iterrows():
-                 adjustments = [random.uniform(-0.5, 0.5) for _ in c_cols]
-                 # Handle potential NaN in percentages before adjustment
-                 current_pcts = [row[col] if pd.notna(row[col]) else 0 for col in c_cols]
-                 new_pcts = np.array(current_pcts) + np.array(adjustments)
-                 new_pcts = np.maximum(0, new_pcts) # Ensure non-negative
-                 total_pct = sum(new_pcts)
-                 if total_pct > 0:
-                     new_pcts = (new_pcts / total_pct) * 100
-                 else:
-                     new_pcts = [20.0] * 5 # Fallback if sum is zero
+            # Nudge every percentage by up to +/-0.5 points, then renormalize each county to 100%
+            # (missing percentages count as 0, counties whose adjusted sum is 0 get 20% each)
+            pcts = df_results[c_cols].fillna(0).to_numpy(dtype=np.float64)
+            pcts += rng.uniform(-0.5, 0.5, pcts.shape)
+            np.maximum(pcts, 0, out=pcts)
+            sums = pcts.sum(axis=1, keepdims=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                pcts = np.where(sums > 0, pcts / sums * 100, 20.0)
 
-                 for i, col in enumerate(c_cols):
-                     df_results.loc[index, col] = round(new_pcts[i], 2)
-                 df_results.loc[index, 'timestamp'] = current_time
+            df_results[c_cols] = np.round(pcts, 2)
+            df_results['timestamp'] = current_time
 
-            df_results.to_csv(results_path, index=False)
+            save_data(df_results, results_path)
             print(f"Updated existing results data at {current_time}")
             updated_any = True
         except Exception as e: